@@ -1,7 +1,16 @@
 # main.py
 
+import functools
+import io
+import logging
+import math
+import mmap
 import os
+import queue
+import stat
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from potraceArgParser import (  # Import the info object
     DEFAULT_DIM,
@@ -21,13 +30,99 @@ from potraceArgParser import (  # Import the info object
 # from trans import trans_from_rect, trans_tighten, trans_scale_to_size, trans_rotate, trans_rescale
 
 
+logger = logging.getLogger(__name__)
+
 POTRACE = "potrace"
 
+MMAP_THRESHOLD = 1 << 24  # map inputs of 16 MiB and up instead of stream-reading
+
+_INF = math.inf  # "not set" sentinel for dimensions and margins
+
+# Bits of the CalcDimensions "unset" mask
+_UNSET_WIDTH = 1 << 0
+_UNSET_HEIGHT = 1 << 1
+_UNSET_LMAR = 1 << 2
+_UNSET_RMAR = 1 << 3
+_UNSET_TMAR = 1 << 4
+_UNSET_BMAR = 1 << 5
+
+
+class PotraceError(Exception):
+    """Fatal error raised out of Main; carries the process exit status."""
+
+    def __init__(self, code: int, msg: str):
+        super().__init__(msg)
+        self.code = code
+        self.msg = msg
+
+
+class ImgInfo:
+    __slots__ = (
+        "pixwidth",
+        "pixheight",
+        "width",
+        "height",
+        "lmar",
+        "rmar",
+        "tmar",
+        "bmar",
+        "trans",
+    )
+
+    def __init__(self, pixwidth: int = 0, pixheight: int = 0):
+        self.reset(pixwidth, pixheight)
+
+    def reset(self, pixwidth: int, pixheight: int) -> None:
+        self.pixwidth = pixwidth
+        self.pixheight = pixheight
+        self.width = _INF
+        self.height = _INF
+        self.lmar = _INF
+        self.rmar = _INF
+        self.tmar = _INF
+        self.bmar = _INF
+        self.trans = None  # Assuming a potrace_trans object later
+
+
+class DimCache:
+    """Command-line dimensions converted once per run rather than per image."""
+
+    __slots__ = ("width", "height", "lmar", "rmar", "tmar", "bmar", "unset")
+
+    def __init__(self, pixel: bool):
+        if pixel:
+            dimDef = 1.0  # Placeholder for pixel-based default
+        else:
+            dimDef = DEFAULT_DIM
+
+        # Ordered to match the _UNSET_* bits: bit i belongs to dimsD[i]
+        dimsD = (
+            info.widthD,
+            info.heightD,
+            info.lmarD,
+            info.rmarD,
+            info.tmarD,
+            info.bmarD,
+        )
+
+        unset = 0
+        values = []
+        for bit, d in enumerate(dimsD):
+            if d.x == _INF:
+                unset |= 1 << bit
+                values.append(_INF)
+            else:
+                values.append(DoubleOfDim(d, dimDef))
+
+        self.width, self.height, self.lmar, self.rmar, self.tmar, self.bmar = values
+        self.unset = unset
 
-def CalcDimensions(imgInfo: object, pList: object) -> None:
 
-    dimDef = 1.0  # Placeholder, adjust based on backend
-    maxwidth, maxheight, sc = float("inf"), float("inf"), 1.0
+def CalcDimensions(
+    imgInfo: ImgInfo, pList: object, dims: DimCache | None = None
+) -> None:
+
+    maxwidth, maxheight, sc = _INF, _INF, 1.0
     defaultScaling = False
 
     if imgInfo.pixwidth == 0:
@@ -35,93 +130,75 @@ def CalcDimensions(imgInfo: object, pList: object) -> None:
     if imgInfo.pixheight == 0:
         imgInfo.pixheight = 1
 
-    if info.backend.pixel:
-        dimDef = 1.0  # Placeholder for pixel-based default
-    else:
-        dimDef = DEFAULT_DIM
+    if dims is None:
+        dims = DimCache(info.backend.pixel)
 
-    imgInfo.width = (
-        DoubleOfDim(info.widthD, dimDef)
-        if info.widthD.x != float("inf")
-        else float("inf")
-    )
-    imgInfo.height = (
-        DoubleOfDim(info.heightD, dimDef)
-        if info.heightD.x != float("inf")
-        else float("inf")
-    )
-    imgInfo.lmar = (
-        DoubleOfDim(info.lmarD, dimDef)
-        if info.lmarD.x != float("inf")
-        else float("inf")
-    )
-    imgInfo.rmar = (
-        DoubleOfDim(info.rmarD, dimDef)
-        if info.rmarD.x != float("inf")
-        else float("inf")
-    )
-    imgInfo.tmar = (
-        DoubleOfDim(info.tmarD, dimDef)
-        if info.tmarD.x != float("inf")
-        else float("inf")
-    )
-    imgInfo.bmar = (
-        DoubleOfDim(info.bmarD, dimDef)
-        if info.bmarD.x != float("inf")
-        else float("inf")
-    )
+    unset = dims.unset
+    imgInfo.width = dims.width
+    imgInfo.height = dims.height
+    imgInfo.lmar = dims.lmar
+    imgInfo.rmar = dims.rmar
+    imgInfo.tmar = dims.tmar
+    imgInfo.bmar = dims.bmar
 
     # trans_from_rect(imgInfo.trans, imgInfo.pixwidth, imgInfo.pixheight) # Assuming trans object exists
-    print("Calling trans_from_rect (mock)")
+    logger.debug("Calling trans_from_rect (mock)")
 
     if info.tight:
         # trans_tighten(imgInfo.trans, pList)
-        print("Calling trans_tighten (mock)")
+        logger.debug("Calling trans_tighten (mock)")
 
     if info.backend.pixel:
-        if imgInfo.width == float("inf") and info.sx != float("inf"):
+        if unset & _UNSET_WIDTH and info.sx != _INF:
             imgInfo.width = 1.0  # imgInfo.trans.bb[0] * info.sx # Placeholder
-        if imgInfo.height == float("inf") and info.sy != float("inf"):
+            unset &= ~_UNSET_WIDTH
+        if unset & _UNSET_HEIGHT and info.sy != _INF:
             imgInfo.height = 1.0  # imgInfo.trans.bb[1] * info.sy # Placeholder
+            unset &= ~_UNSET_HEIGHT
     else:
-        if imgInfo.width == float("inf") and info.rx != float("inf"):
+        if unset & _UNSET_WIDTH and info.rx != _INF:
             imgInfo.width = 72.0  # imgInfo.trans.bb[0] / info.rx * 72 # Placeholder
-        if imgInfo.height == float("inf") and info.ry != float("inf"):
+            unset &= ~_UNSET_WIDTH
+        if unset & _UNSET_HEIGHT and info.ry != _INF:
             imgInfo.height = 72.0  # imgInfo.trans.bb[1] / info.ry * 72 # Placeholder
+            unset &= ~_UNSET_HEIGHT
 
-    if imgInfo.width == float("inf") and imgInfo.height != float("inf"):
+    unsetSize = unset & (_UNSET_WIDTH | _UNSET_HEIGHT)
+    if unsetSize == _UNSET_WIDTH:
         imgInfo.width = 1.0  # imgInfo.height / imgInfo.trans.bb[1] * imgInfo.trans.bb[0] / info.stretch # Placeholder
-    elif imgInfo.width != float("inf") and imgInfo.height == float("inf"):
+    elif unsetSize == _UNSET_HEIGHT:
         imgInfo.height = 1.0  # imgInfo.width / imgInfo.trans.bb[0] * imgInfo.trans.bb[1] * info.stretch # Placeholder
-
-    if imgInfo.width == float("inf") and imgInfo.height == float("inf"):
+    elif unsetSize:
         imgInfo.width = 1.0  # imgInfo.trans.bb[0] # Placeholder
         imgInfo.height = 1.0  # imgInfo.trans.bb[1] * info.stretch # Placeholder
         defaultScaling = True
 
     # trans_scale_to_size(imgInfo.trans, imgInfo.width, imgInfo.height)
-    print("Calling trans_scale_to_size (mock)")
+    logger.debug("Calling trans_scale_to_size (mock)")
 
     if info.angle != 0.0:
         # trans_rotate(imgInfo.trans, info.angle)
-        print("Calling trans_rotate (mock)")
+        logger.debug("Calling trans_rotate (mock)")
         if info.tight:
             # trans_tighten(imgInfo.trans, pList)
-            print("Calling trans_tighten (mock)")
+            logger.debug("Calling trans_tighten (mock)")
+
+    unsetX = unset & (_UNSET_LMAR | _UNSET_RMAR)
+    unsetY = unset & (_UNSET_TMAR | _UNSET_BMAR)
 
     if defaultScaling and info.backend.fixed:
-        if imgInfo.lmar != float("inf") and imgInfo.rmar != float("inf"):
+        if not unsetX:
             maxwidth = info.paperWidth - imgInfo.lmar - imgInfo.rmar
-        if imgInfo.bmar != float("inf") and imgInfo.tmar != float("inf"):
+        if not unsetY:
             maxheight = info.paperHeight - imgInfo.bmar - imgInfo.tmar
 
-        if maxwidth == float("inf") and maxheight == float("inf"):
+        if maxwidth == _INF and maxheight == _INF:
             maxwidth = max(info.paperWidth - 144, info.paperWidth * 0.75)
             maxheight = max(info.paperHeight - 144, info.paperHeight * 0.75)
 
-        if maxwidth == float("inf"):
+        if maxwidth == _INF:
             sc = maxheight  # / imgInfo.trans.bb[1] # Placeholder
-        elif maxheight == float("inf"):
+        elif maxheight == _INF:
             sc = maxwidth  # / imgInfo.trans.bb[0] # Placeholder
         else:
             sc = min(maxwidth, maxheight)  # Placeholder
@@ -129,114 +206,247 @@ def CalcDimensions(imgInfo: object, pList: object) -> None:
         imgInfo.width *= sc
         imgInfo.height *= sc
         # trans_rescale(imgInfo.trans, sc)
-        print("Calling trans_rescale (mock)")
+        logger.debug("Calling trans_rescale (mock)")
 
     if info.backend.fixed:
-        if imgInfo.lmar == float("inf") and imgInfo.rmar == float("inf"):
+        if unsetX == _UNSET_LMAR | _UNSET_RMAR:
             imgInfo.lmar = (info.paperWidth - 100) / 2  # Placeholder
-        elif imgInfo.lmar == float("inf"):
+        elif unsetX == _UNSET_LMAR:
             imgInfo.lmar = info.paperWidth - 100  # Placeholder
-        elif imgInfo.lmar != float("inf") and imgInfo.rmar != float("inf"):
+        elif not unsetX:
             imgInfo.lmar += 10  # Placeholder
 
-        if imgInfo.bmar == float("inf") and imgInfo.tmar == float("inf"):
+        if unsetY == _UNSET_TMAR | _UNSET_BMAR:
             imgInfo.bmar = (info.paperHeight - 100) / 2  # Placeholder
-        elif imgInfo.bmar == float("inf"):
+        elif unsetY == _UNSET_BMAR:
             imgInfo.bmar = info.paperHeight - 100  # Placeholder
-        elif imgInfo.bmar != float("inf") and imgInfo.tmar != float("inf"):
+        elif not unsetY:
             imgInfo.bmar += 10  # Placeholder
     else:
-        imgInfo.lmar = 0 if imgInfo.lmar == float("inf") else imgInfo.lmar
-        imgInfo.rmar = 0 if imgInfo.rmar == float("inf") else imgInfo.rmar
-        imgInfo.tmar = 0 if imgInfo.tmar == float("inf") else imgInfo.tmar
-        imgInfo.bmar = 0 if imgInfo.bmar == float("inf") else imgInfo.bmar
+        if unset & _UNSET_LMAR:
+            imgInfo.lmar = 0
+        if unset & _UNSET_RMAR:
+            imgInfo.rmar = 0
+        if unset & _UNSET_TMAR:
+            imgInfo.tmar = 0
+        if unset & _UNSET_BMAR:
+            imgInfo.bmar = 0
 
 
 def MyFOpenRead(filename: str | None) -> object:
     if filename is None or filename == "-":
         return sys.stdin
     try:
-        return open(filename, "rb")
+        f = open(filename, "rb", buffering=info.ioBufferSize)
     except IOError as e:
-        print(f"Error opening file {filename}: {e}")
-        sys.exit(2)
+        raise PotraceError(2, f"Error opening file {filename}: {e}")
+
+    # Large regular files are mapped so bm_read can slice the raster without
+    # copying it through the read buffer. The map holds its own descriptor.
+    try:
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+            return f
+        m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return f
+    if hasattr(mmap, "MADV_SEQUENTIAL"):
+        m.madvise(mmap.MADV_SEQUENTIAL)
+    f.close()
+    return m
 
 
 def MyFOpenWrite(filename: str | None) -> object:
     if filename is None or filename == "-":
-        return sys.stdout
+        # Same binary, large-buffered stream the backends get for real files
+        sys.stdout.flush()
+        return io.BufferedWriter(sys.stdout.buffer, buffer_size=info.ioBufferSize)
     try:
-        return open(filename, "wb")
+        return open(filename, "wb", buffering=info.ioBufferSize)
     except IOError as e:
-        print(f"Error opening file {filename}: {e}")
-        sys.exit(2)
+        raise PotraceError(2, f"Error opening file {filename}: {e}")
 
 
 def MyFClose(f: object, filename: str | None) -> None:
-    if filename is not None and filename != "-" and f is not None:
-        try:
-            f.close()
-        except IOError as e:
-            print(f"Error closing file {filename}: {e}")
+    if f is None:
+        return
+    if filename is None or filename == "-":
+        # Flush our stdout wrapper but leave sys.stdout itself open
+        if isinstance(f, io.BufferedWriter):
+            f.flush()
+            f.detach()
+        return
+    try:
+        f.close()
+    except IOError as e:
+        print(f"Error closing file {filename}: {e}")
 
 
-def MakeOutFilename(infile: str, ext: str) -> str:
+@functools.lru_cache(maxsize=1024)
+def MakeOutFilename(infile: str, ext: str, _splitext=os.path.splitext) -> str:
     if infile == "-":
         return "-"
 
-    base, _ = os.path.splitext(infile)
-    outfile = base + ext
+    # infile == base + oldExt, so it only collides with the output name
+    # when the extensions match
+    base, oldExt = _splitext(infile)
+    if oldExt == ext:
+        return base + "-out" + ext
+    return base + ext
 
-    if infile == outfile:
-        outfile = base + "-out" + ext
 
-    return outfile
+def ReadBitmap(fin: object) -> object:
+    # return bm_read(fin, info.blackLevel) # Assume bm_read returns bitmap object
+    return None  # Placeholder
+
+
+def IsRegularInput(fin: object) -> bool:
+    """True when reading fin never waits on another process (file or mmap)."""
+    if isinstance(fin, mmap.mmap):
+        return True
+    if fin is sys.stdin:
+        return False
+    try:
+        return stat.S_ISREG(os.fstat(fin.fileno()).st_mode)
+    except (AttributeError, OSError, ValueError):
+        return False
+
+
+def ReadBitmaps(fin: object, bitmaps: queue.Queue, stop: threading.Event) -> None:
+    """Reader stage of ProcessFile: queue every bitmap in fin, then None.
+
+    A read error is queued in place of the None, for ProcessFile to re-raise.
+    """
+    try:
+        while not stop.is_set():
+            bm = ReadBitmap(fin)
+            if bm is None:
+                break
+            bitmaps.put(bm)
+    except Exception as e:
+        bitmaps.put(e)
+    else:
+        bitmaps.put(None)
 
 
 def ProcessFile(
-    b: Backend, infile: str, outfile: str, fin: object, fout: object
+    b: Backend,
+    infile: str,
+    outfile: str,
+    fin: object,
+    fout: object,
+    dims: DimCache | None = None,
 ) -> None:
     count = 0
     eofFlag = False
 
-    while True:
-        # bm = bm_read(fin, info.blackLevel) # Assume bm_read returns bitmap object
-        bm = None  # Placeholder
-        if bm is None:  # Simulate end of file or error
-            if count == 0 and eofFlag:
-                print(f"{POTRACE}: {infile}: empty file")
-                sys.exit(2)
-            break
-
-        if info.invert:
-            # bm_invert(bm)
-            print("Calling bm_invert (mock)")
+    # Loop invariants, bound once rather than looked up per bitmap
+    page_f = b.page_f
+    multi = b.multi
+    invert = info.invert
+
+    # page_f consumes imgInfo synchronously, so one instance serves every page
+    imgInfo = ImgInfo()
+
+    # Multi-page backends read the next bitmap on a helper thread while
+    # this one traces and writes the current page. Only regular files are
+    # read ahead: a reader blocked on a pipe could not be stopped on error.
+    reader = None
+    if multi and IsRegularInput(fin):
+        bitmaps = queue.Queue(maxsize=2)
+        stop = threading.Event()
+        reader = threading.Thread(
+            target=ReadBitmaps, args=(fin, bitmaps, stop), daemon=True
+        )
+        reader.start()
+        nextBitmap = bitmaps.get
+    else:
+        nextBitmap = functools.partial(ReadBitmap, fin)
 
-        # st = potrace_trace(info.param, bm)
-        st = None  # Placeholder
-        if st is None:
-            print(f"{POTRACE}: {infile}: error during tracing")
-            sys.exit(2)
+    try:
+        while True:
+            bm = nextBitmap()
+            if isinstance(bm, Exception):
+                raise bm
+            if bm is None:  # Simulate end of file or error
+                if count == 0 and eofFlag:
+                    raise PotraceError(2, f"{POTRACE}: {infile}: empty file")
+                break
+
+            if invert:
+                # bm_invert(bm)
+                logger.debug("Calling bm_invert (mock)")
+
+            # st = potrace_trace(info.param, bm)
+            st = None  # Placeholder
+            if st is None:
+                raise PotraceError(2, f"{POTRACE}: {infile}: error during tracing")
+
+            imgInfo.reset(100, 100)  # bm.w, bm.h # Placeholder
+            # bm_free(bm)
+            logger.debug("Calling bm_free (mock)")
+
+            CalcDimensions(imgInfo, None, dims)  # st.plist
+
+            r = page_f(fout, None, imgInfo)  # st.plist
+            if r:
+                raise PotraceError(
+                    2, f"{POTRACE}: {outfile}: error in backend's page function"
+                )
+
+            # potrace_state_free(st)
+            logger.debug("Calling potrace_state_free (mock)")
+
+            count += 1
+            if eofFlag or not multi:
+                break
+    finally:
+        if reader is not None:
+            # Unblock and retire the reader before the caller closes fin. After
+            # one drain its remaining puts (a bitmap, then the end marker) fit.
+            stop.set()
+            while not bitmaps.empty():
+                bitmaps.get_nowait()
+            reader.join()
+
+
+def ProcessInfile(b: Backend, infile: str, dims: DimCache | None = None) -> None:
+    outfile = MakeOutFilename(infile, b.ext)
+    fin = MyFOpenRead(infile)
+    if not fin:
+        return
+    try:
+        fout = MyFOpenWrite(outfile)
+        if not fout:
+            return
+        try:
+            if b.init_f:
+                b.init_f(fout)
+            ProcessFile(b, infile, outfile, fin, fout, dims)
+            if b.term_f:
+                b.term_f(fout)
+        finally:
+            MyFClose(fout, outfile)
+    finally:
+        MyFClose(fin, infile)
 
-        imgInfo = type("imgInfo", (object,), {})()
-        imgInfo.pixwidth = 100  # bm.w # Placeholder
-        imgInfo.pixheight = 100  # bm.h # Placeholder
-        # bm_free(bm)
-        print("Calling bm_free (mock)")
 
-        CalcDimensions(imgInfo, None)  # st.plist
+def ProcessInfiles(b: Backend, infiles: list, dims: DimCache | None = None) -> None:
+    for infile in infiles:
+        ProcessInfile(b, infile, dims)
 
-        r = b.page_f(fout, None, imgInfo)  # st.plist
-        if r:
-            print(f"{POTRACE}: {outfile}: error in backend's page function")
-            sys.exit(2)
 
-        # potrace_state_free(st)
-        print("Calling potrace_state_free (mock)")
+def GroupInfilesByOutput(infiles: list, ext: str) -> list:
+    """Split infiles into groups that write disjoint output files.
 
-        count += 1
-        if eofFlag or not b.multi:
-            break
+    Inputs that share an output file (a file listed twice, a.pbm and a.bmp,
+    or two paths to it) must be processed in order by one task, as they are
+    serially. Groups and the files in them keep their command-line order.
+    """
+    groups = {}
+    for infile in infiles:
+        outfile = os.path.normcase(os.path.realpath(MakeOutFilename(infile, ext)))
+        groups.setdefault(outfile, []).append(infile)
+    return list(groups.values())
 
 
 def Main() -> None:
@@ -244,73 +454,94 @@ def Main() -> None:
 
     b = info.backend
     if b is None:
-        print(f"{POTRACE}: internal error: selected backend not found")
-        sys.exit(1)
+        raise PotraceError(1, f"{POTRACE}: internal error: selected backend not found")
 
     if b.opticurve == 0:
         pass  # info.param.opticurve = 0 # Assume param is initialized
 
+    dims = DimCache(b.pixel)
+
     if not info.someInfiles:
         fout = MyFOpenWrite(info.outFile)
         if not fout:
-            print(
-                f"{POTRACE}: {(info.outFile if info.outFile else 'stdout')}: could not open output"
+            raise PotraceError(
+                2,
+                f"{POTRACE}: {(info.outFile if info.outFile else 'stdout')}: could not open output",
             )
-            sys.exit(2)
-        if b.init_f:
-            b.init_f(fout)
-        ProcessFile(
-            b, "stdin", info.outFile if info.outFile else "stdout", sys.stdin, fout
-        )
-        if b.term_f:
-            b.term_f(fout)
-        MyFClose(fout, info.outFile)
-
-    elif not info.outFile:
-        for infile in info.infiles:
-            outfile = MakeOutFilename(infile, b.ext)
-            fin = MyFOpenRead(infile)
-            if not fin:
-                continue
-            fout = MyFOpenWrite(outfile)
-            if not fout:
-                MyFClose(fin, infile)
-                continue
+        try:
             if b.init_f:
                 b.init_f(fout)
-            ProcessFile(b, infile, outfile, fin, fout)
+            ProcessFile(
+                b,
+                "stdin",
+                info.outFile if info.outFile else "stdout",
+                sys.stdin,
+                fout,
+                dims,
+            )
             if b.term_f:
                 b.term_f(fout)
-            MyFClose(fin, infile)
-            MyFClose(fout, outfile)
+        finally:
+            # Also releases the stdout wrapper, which would otherwise close
+            # sys.stdout.buffer when garbage-collected
+            MyFClose(fout, info.outFile)
+
+    elif not info.outFile:
+        if info.jobs > 1 and info.infileCount > 1:
+            groups = GroupInfilesByOutput(info.infiles, b.ext)
+            with ThreadPoolExecutor(max_workers=min(info.jobs, len(groups))) as ex:
+                futures = [
+                    ex.submit(ProcessInfiles, b, group, dims) for group in groups
+                ]
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                except BaseException:
+                    # Like the serial loop, start no new files after an error
+                    for future in futures:
+                        future.cancel()
+                    raise
+        else:
+            ProcessInfiles(b, info.infiles, dims)
 
     else:
         if not b.multi and info.infileCount >= 2:
-            print(
-                f"{POTRACE}: cannot use multiple input files with -o in {b.name} mode"
+            raise PotraceError(
+                1,
+                f"{POTRACE}: cannot use multiple input files with -o in {b.name} mode",
             )
-            sys.exit(1)
         if info.infileCount == 0:
-            print(f"{POTRACE}: cannot use empty list of input files with -o")
-            sys.exit(1)
+            raise PotraceError(
+                1, f"{POTRACE}: cannot use empty list of input files with -o"
+            )
 
         fout = MyFOpenWrite(info.outFile)
         if not fout:
-            print(f"{POTRACE}: {info.outFile}: could not open output file")
-            sys.exit(2)
-        if b.init_f:
-            b.init_f(fout)
-        for infile in info.infiles:
-            fin = MyFOpenRead(infile)
-            if not fin:
-                continue
-            ProcessFile(b, infile, info.outFile, fin, fout)
-            MyFClose(fin, infile)
-        if b.term_f:
-            b.term_f(fout)
-        MyFClose(fout, info.outFile)
+            raise PotraceError(
+                2, f"{POTRACE}: {info.outFile}: could not open output file"
+            )
+        try:
+            if b.init_f:
+                b.init_f(fout)
+            outFile = info.outFile
+            for infile in info.infiles:
+                fin = MyFOpenRead(infile)
+                if not fin:
+                    continue
+                try:
+                    ProcessFile(b, infile, outFile, fin, fout, dims)
+                finally:
+                    MyFClose(fin, infile)
+            if b.term_f:
+                b.term_f(fout)
+        finally:
+            MyFClose(fout, info.outFile)
 
 
 if __name__ == "__main__":
 
-    Main()
+    try:
+        Main()
+    except PotraceError as e:
+        print(e.msg, file=sys.stderr)
+        sys.exit(e.code)
@@ -1,15 +1,26 @@
 # potraceArgParser.py
 
-import argparse
-import math
+import functools
+import logging
+import re
 import sys
-from typing import List, Optional
+from typing import TYPE_CHECKING, Callable, List, NamedTuple, Optional
 
 # Assume these dependencies are implemented elsewhere
 # from potracelib import potrace_param_default, potrace_trace
 # from bitmap_io import bm_read, bm_free
 # from progress_bar import progress_bar_vt100, progress_bar_simplified
 
+if TYPE_CHECKING:
+    import argparse
+
+# Resolved once at import; DoOptions runs once per process, so handing out
+# the shared objects is safe
+_DEFAULT_PARAM = None  # potrace_param_default()
+_DEFAULT_PROGRESS_BAR = None  # DEFAULT_PROGRESS_BAR
+
+logger = logging.getLogger(__name__)
+
 VERSION = "1.16"  # Replace with actual version if needed
 POTRACE = "potrace"
 
@@ -21,11 +32,27 @@ DEFAULT_PAPERWIDTH = 595
 DEFAULT_PAPERHEIGHT = 842
 DEFAULT_DIM = 1.0  # Default unit multiplier (e.g., 72 for points if needed)
 
+DEFAULT_IO_BUFFER_SIZE = 1 << 20  # 1 MiB; the 8 KiB io default costs extra syscalls
+
 DIM_IN = 72.0
 DIM_CM = 72.0 / 2.54
 DIM_MM = 72.0 / 25.4
 DIM_PT = 1.0
 
+_UNIT_TABLE = {"in": DIM_IN, "cm": DIM_CM, "mm": DIM_MM, "pt": DIM_PT}
+
+# The strings float() accepts, so ParseDimension can test instead of catching
+_DIGITS = r"\d(?:_?\d)*"
+_NUMBER_RE = re.compile(
+    rf"\s*[+-]?(?:(?:{_DIGITS}(?:\.(?:{_DIGITS})?)?|\.{_DIGITS})"
+    rf"(?:[eE][+-]?{_DIGITS})?|(?i:inf(?:inity)?|nan))\s*"
+)
+
+# (psLevel, compress) for each PostScript/EPS/PDF compression option
+_PS_MODES = {"cleartext": (2, 0), "level2": (2, 1), "level3": (3, 1)}
+
+_COLOR_RE = re.compile(r"#[0-9A-Fa-f]{6}\Z")
+
 POTRACE_TURNPOLICY_BLACK = 0
 POTRACE_TURNPOLICY_WHITE = 1
 POTRACE_TURNPOLICY_LEFT = 2
@@ -35,14 +62,13 @@ POTRACE_TURNPOLICY_MAJORITY = 5
 POTRACE_TURNPOLICY_RANDOM = 6
 
 
-class PageFormat:
-    def __init__(self, name: str, w: int, h: int):
-        self.name = name
-        self.w = w
-        self.h = h
+class PageFormat(NamedTuple):
+    name: str
+    w: int
+    h: int
 
 
-pageFormats = [
+pageFormats = (
     PageFormat("a4", 595, 842),
     PageFormat("a3", 842, 1191),
     PageFormat("a5", 421, 595),
@@ -55,16 +81,17 @@ pageFormats = [
     PageFormat("folio", 612, 936),
     PageFormat("quarto", 610, 780),
     PageFormat("10x14", 720, 1008),
-]
+)
 
+_PAGEFORMAT_BY_NAME = {sys.intern(pf.name.lower()): pf for pf in pageFormats}
 
-class TurnPolicy:
-    def __init__(self, name: str, n: int):
-        self.name = name
-        self.n = n
 
+class TurnPolicy(NamedTuple):
+    name: str
+    n: int
 
-turnPolicies = [
+
+turnPolicies = (
     TurnPolicy("black", POTRACE_TURNPOLICY_BLACK),
     TurnPolicy("white", POTRACE_TURNPOLICY_WHITE),
     TurnPolicy("left", POTRACE_TURNPOLICY_LEFT),
@@ -72,105 +99,95 @@ turnPolicies = [
     TurnPolicy("minority", POTRACE_TURNPOLICY_MINORITY),
     TurnPolicy("majority", POTRACE_TURNPOLICY_MAJORITY),
     TurnPolicy("random", POTRACE_TURNPOLICY_RANDOM),
-]
-
-
-class Backend:
-    def __init__(
-        self,
-        name: str,
-        ext: str,
-        fixed: bool,
-        pixel: bool,
-        multi: bool,
-        init_f,
-        page_f,
-        term_f,
-        opticurve: bool,
-    ):
-        self.name = name
-        self.ext = ext
-        self.fixed = fixed
-        self.pixel = pixel
-        self.multi = multi
-        self.init_f = init_f
-        self.page_f = page_f
-        self.term_f = term_f
-        self.opticurve = opticurve
+)
+
+_TURNPOLICY_BY_NAME = {sys.intern(tp.name.lower()): tp for tp in turnPolicies}
+
+
+class Backend(NamedTuple):
+    name: str
+    ext: str
+    fixed: bool
+    pixel: bool
+    multi: bool
+    init_f: Optional[Callable]
+    page_f: Callable
+    term_f: Optional[Callable]
+    opticurve: bool
 
 
 # Assume backend implementations are available
 def page_svg(fout, plist, imginfo) -> None:
-    print("Calling page_svg (mock)")
+    logger.debug("Calling page_svg (mock)")
     pass
 
 
 def InitPdf(fout) -> None:
-    print("Calling InitPdf (mock)")
+    logger.debug("Calling InitPdf (mock)")
     pass
 
 
 def PagePdf(fout, plist, imginfo) -> None:
-    print("Calling PagePdf (mock)")
+    logger.debug("Calling PagePdf (mock)")
     pass
 
 
 def PagePdfPage(fout, plist, imginfo) -> None:
-    print("Calling PagePdfPage (mock)")
+    logger.debug("Calling PagePdfPage (mock)")
     pass
 
 
 def TermPdf(fout) -> None:
-    print("Calling TermPdf (mock)")
+    logger.debug("Calling TermPdf (mock)")
     pass
 
 
 def PageEps(fout, plist, imginfo) -> None:
-    print("Calling PageEps (mock)")
+    logger.debug("Calling PageEps (mock)")
     pass
 
 
 def InitPs(fout) -> None:
-    print("Calling InitPs (mock)")
+    logger.debug("Calling InitPs (mock)")
     pass
 
 
 def PagePs(fout, plist, imginfo) -> None:
-    print("Calling PagePs (mock)")
+    logger.debug("Calling PagePs (mock)")
     pass
 
 
 def TermPs(fout) -> None:
-    print("Calling TermPs (mock)")
+    logger.debug("Calling TermPs (mock)")
     pass
 
 
 def PageDxf(fout, plist, imginfo) -> None:
-    print("Calling PageDxf (mock)")
+    logger.debug("Calling PageDxf (mock)")
     pass
 
 
 def PageGeoJson(fout, plist, imginfo) -> None:
-    print("Calling PageGeoJson (mock)")
+    logger.debug("Calling PageGeoJson (mock)")
     pass
 
 
 def PagePgm(fout, plist, imginfo) -> None:
-    print("Calling PagePgm (mock)")
+    logger.debug("Calling PagePgm (mock)")
     pass
 
 
 def PageGimp(fout, plist, imginfo) -> None:
-    print("Calling PageGimp (mock)")
+    logger.debug("Calling PageGimp (mock)")
     pass
 
 
 def PageXfig(fout, plist, imginfo) -> None:
-    print("Calling PageXfig (mock)")
+    logger.debug("Calling PageXfig (mock)")
     pass
 
 
-backendListGlobal = [
+backendListGlobal = (
     Backend("svg", ".svg", False, False, False, None, page_svg, None, True),
     Backend("pdf", ".pdf", False, False, True, InitPdf, PagePdf, TermPdf, True),
     Backend("pdfpage", ".pdf", True, False, True, InitPdf, PagePdfPage, TermPdf, True),
@@ -182,10 +199,68 @@ backendListGlobal = [
     Backend("pgm", ".pgm", False, True, True, None, PagePgm, None, True),
     Backend("gimppath", ".svg", False, True, False, None, PageGimp, None, True),
     Backend("xfig", ".fig", True, False, False, None, PageXfig, None, False),
-]
+)
+
+# Keys are interned so lookups with the canonical (literal, hence interned)
+# names hit on identity before any character comparison
+_BACKENDS_BY_NAME = {sys.intern(b.name.lower()): b for b in backendListGlobal}
+
+# Backends selected by the fixed flags (-e is also the default, -s, -p, -g)
+_BACKEND_EPS = _BACKENDS_BY_NAME["eps"]
+_BACKEND_SVG = _BACKENDS_BY_NAME["svg"]
+_BACKEND_POSTSCRIPT = _BACKENDS_BY_NAME["postscript"]
+_BACKEND_PGM = _BACKENDS_BY_NAME["pgm"]
+
+
+class Dim:
+    __slots__ = ("x", "d")
+
+    def __init__(self, x: float = 0.0, d: float = 0.0):
+        self.x = x
+        self.d = d
 
 
 class Info:
+    __slots__ = (
+        "backend",
+        "debug",
+        "widthD",
+        "heightD",
+        "rx",
+        "ry",
+        "sx",
+        "sy",
+        "stretch",
+        "lmarD",
+        "rmarD",
+        "tmarD",
+        "bmarD",
+        "angle",
+        "paperWidth",
+        "paperHeight",
+        "tight",
+        "unit",
+        "compress",
+        "psLevel",
+        "color",
+        "gamma",
+        "param",
+        "longCoding",
+        "outFile",
+        "blackLevel",
+        "invert",
+        "opaque",
+        "grouping",
+        "fillColor",
+        "progress",
+        "progressBar",
+        "infiles",
+        "infileCount",
+        "someInfiles",
+        "ioBufferSize",
+        "jobs",
+    )
+
     def __init__(self):
         self.backend: Optional[Backend] = None
         self.debug: int = 0
@@ -222,65 +297,71 @@ class Info:
         self.infiles: List[str] = []
         self.infileCount: int = 0
         self.someInfiles: bool = False
+        self.ioBufferSize: int = DEFAULT_IO_BUFFER_SIZE
+        self.jobs: int = 1
 
 
 info = Info()
 
 
-class Dim:
-    def __init__(self, x: float = 0.0, d: float = 0.0):
-        self.x = x
-        self.d = d
-
+def BackendLookup(name: str) -> tuple[int, Optional[Backend]]:
+    """Return (0, backend) on a match, (1, None) if unknown, (2, None) if ambiguous."""
+    nameLower = name if name.islower() else name.lower()
+    b = _BACKENDS_BY_NAME.get(nameLower)
+    if b is not None:
+        return 0, b
 
-def BackendLookup(name: str, bp: List[Optional[Backend]]) -> int:
+    # No exact hit; accept an unambiguous prefix. The dict keys are already
+    # lowercased and keep the backendListGlobal order.
     matches = 0
     bMatch = None
 
-    for b in backendListGlobal:
-        if b.name.lower() == name.lower():
-            bp[0] = b
-            return 0
-        elif b.name.lower().startswith(name.lower()):
+    for key, b in _BACKENDS_BY_NAME.items():
+        if key.startswith(nameLower):
             matches += 1
             bMatch = b
 
     if matches == 1:
-        bp[0] = bMatch
-        return 0
+        return 0, bMatch
     elif matches > 1:
-        return 2
+        return 2, None
     else:
-        return 1
+        return 1, None
 
 
 def BackendList(fout, j: int, linelen: int) -> int:
+    parts = []
+    last = len(backendListGlobal) - 1
     for i, b in enumerate(backendListGlobal):
         if j + len(b.name) > linelen:
-            fout.write("\n")
+            parts.append("\n")
             j = 0
-        j += fout.write(b.name)
-        if i < len(backendListGlobal) - 1:
-            j += fout.write(", ")
+        token = b.name if i == last else b.name + ", "
+        parts.append(token)
+        j += len(token)
+    fout.write("".join(parts))
     return j
 
 
+_LICENSE_TEXT = (
+    "This program is free software; you can redistribute it and/or modify\n"
+    "it under the terms of the GNU General Public License as published by\n"
+    "the Free Software Foundation; either version 2 of the License, or\n"
+    "(at your option) any later version.\n"
+    "\n"
+    "This program is distributed in the hope that it will be useful,\n"
+    "but WITHOUT ANY WARRANTY; without even the implied warranty of\n"
+    "MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the\n"
+    "GNU General Public License for more details.\n"
+    "\n"
+    "You should have received a copy of the GNU General Public License\n"
+    "along with this program; if not, write to the Free Software Foundation\n"
+    "Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.\n"
+)
+
+
 def LicenseInfo(f) -> None:
-    f.write(
-        "This program is free software; you can redistribute it and/or modify\n"
-        "it under the terms of the GNU General Public License as published by\n"
-        "the Free Software Foundation; either version 2 of the License, or\n"
-        "(at your option) any later version.\n"
-        "\n"
-        "This program is distributed in the hope that it will be useful,\n"
-        "but WITHOUT ANY WARRANTY; without even the implied warranty of\n"
-        "MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the\n"
-        "GNU General Public License for more details.\n"
-        "\n"
-        "You should have received a copy of the GNU General Public License\n"
-        "along with this program; if not, write to the Free Software Foundation\n"
-        "Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.\n"
-    )
+    f.write(_LICENSE_TEXT)
 
 
 def ShowDefaults(f) -> None:
@@ -288,127 +369,104 @@ def ShowDefaults(f) -> None:
     f.write(f"Default page size: {DEFAULT_PAPERFORMAT}\n")
 
 
+_USAGE_BACKENDS_LABEL = "Backends are: "
+
+# Static part of the --help text, assembled once at import
+_USAGE_TEXT = "".join(
+    (
+        f"Usage: {POTRACE} [options] [filename...]\n",
+        "General options:\n",
+        " -h, --help                 - print this help message and exit\n",
+        " -v, --version              - print version info and exit\n",
+        " -l, --license              - print license info and exit\n",
+        "File selection:\n",
+        " <filename>                 - an input file\n",
+        " -o, --output <filename>    - write all output to this file\n",
+        " -j, --jobs <n>             - process n input files in parallel (default 1)\n",
+        " --                         - end of options; 0 or more input filenames follow\n",
+        "Backend selection:\n",
+        " -b, --backend <name>       - select backend by name\n",
+        " -b svg, -s, --svg          - SVG backend (scalable vector graphics)\n",
+        " -b pdf                     - PDF backend (portable document format)\n",
+        " -b pdfpage                 - fixed page-size PDF backend\n",
+        " -b eps, -e, --eps          - EPS backend (encapsulated PostScript) (default)\n",
+        " -b ps, -p, --postscript    - PostScript backend\n",
+        " -b pgm, -g, --pgm          - PGM backend (portable greymap)\n",
+        " -b dxf                     - DXF backend (drawing interchange format)\n",
+        " -b geojson                 - GeoJSON backend\n",
+        " -b gimppath                - Gimppath backend (GNU Gimp)\n",
+        " -b xfig                    - XFig backend\n",
+        "Algorithm options:\n",
+        " -z, --turnpolicy <policy>  - how to resolve ambiguities in path decomposition\n",
+        " -t, --turdsize <n>         - suppress speckles of up to this size (default 2)\n",
+        " -a, --alphamax <n>         - corner threshold parameter (default 1)\n",
+        " -n, --longcurve            - turn off curve optimization\n",
+        " -O, --opttolerance <n>     - curve optimization tolerance (default 0.2)\n",
+        " -u, --unit <n>             - quantize output to 1/unit pixels (default 10)\n",
+        " -d, --debug <n>            - produce debugging output of type n (n=1,2,3)\n",
+        "Scaling and placement options:\n",
+        " -P, --pagesize <format>    - page size (default is a4)\n",
+        " -W, --width <dim>          - width of output image\n",
+        " -H, --height <dim>         - height of output image\n",
+        " -r, --resolution <n>[x<n>] - resolution (in dpi) (dimension-based backends)\n",
+        " -x, --scale <n>[x<n>]      - scaling factor (pixel-based backends)\n",
+        " -S, --stretch <n>          - yresolution/xresolution\n",
+        " -A, --rotate <angle>       - rotate counterclockwise by angle\n",
+        " -M, --margin <dim>         - margin\n",
+        " -L, --leftmargin <dim>     - left margin\n",
+        " -R, --rightmargin <dim>    - right margin\n",
+        " -T, --topmargin <dim>      - top margin\n",
+        " -B, --bottommargin <dim>   - bottom margin\n",
+        " --tight                    - remove whitespace around the input image\n",
+        "Color options, supported by some backends:\n",
+        " -C, --color #rrggbb        - set foreground color (default black)\n",
+        " --fillcolor #rrggbb        - set fill color (default transparent)\n",
+        " --opaque                   - make white shapes opaque\n",
+        "SVG options:\n",
+        " --group                    - group related paths together\n",
+        " --flat                     - whole image as a single path\n",
+        "Postscript/EPS/PDF options:\n",
+        " -c, --cleartext            - do not compress the output\n",
+        " -2, --level2               - use postscript level 2 compression (default)\n",
+        (
+            " -3, --level3               - use postscript level 3 compression\n"
+            if HAVE_ZLIB
+            else ""
+        ),
+        " -q, --longcoding           - do not optimize for file size\n",
+        "PGM options:\n",
+        " -G, --gamma <n>            - gamma value for anti-aliasing (default 2.2)\n",
+        "Frontend options:\n",
+        " -k, --blacklevel <n>       - black/white cutoff in input file (default 0.5)\n",
+        " -i, --invert               - invert bitmap\n",
+        "Progress bar options:\n",
+        " --progress                 - show progress bar\n",
+        " --tty <mode>               - progress bar rendering: vt100 or dumb\n",
+        "\n",
+        "Dimensions can have optional units, e.g. 6.5in, 15cm, 100pt.\n",
+        f"Default is {DEFAULT_DIM_NAME} (or pixels for pgm, dxf, and gimppath backends).\n",
+        "Possible input file formats are: pnm (pbm, pgm, ppm), bmp.\n",
+        _USAGE_BACKENDS_LABEL,
+    )
+)
+
+
 def UsageInfo(f) -> None:
-    f.write(f"Usage: {POTRACE} [options] [filename...]\n")
-    f.write("General options:\n")
-    f.write(" -h, --help                 - print this help message and exit\n")
-    f.write(" -v, --version              - print version info and exit\n")
-    f.write(" -l, --license              - print license info and exit\n")
-    f.write("File selection:\n")
-    f.write(" <filename>                 - an input file\n")
-    f.write(" -o, --output <filename>    - write all output to this file\n")
-    f.write(
-        " --                         - end of options; 0 or more input filenames follow\n"
-    )
-    f.write("Backend selection:\n")
-    f.write(" -b, --backend <name>       - select backend by name\n")
-    f.write(" -b svg, -s, --svg          - SVG backend (scalable vector graphics)\n")
-    f.write(" -b pdf                     - PDF backend (portable document format)\n")
-    f.write(" -b pdfpage                 - fixed page-size PDF backend\n")
-    f.write(
-        " -b eps, -e, --eps          - EPS backend (encapsulated PostScript) (default)\n"
-    )
-    f.write(" -b ps, -p, --postscript    - PostScript backend\n")
-    f.write(" -b pgm, -g, --pgm          - PGM backend (portable greymap)\n")
-    f.write(" -b dxf                     - DXF backend (drawing interchange format)\n")
-    f.write(" -b geojson                 - GeoJSON backend\n")
-    f.write(" -b gimppath                - Gimppath backend (GNU Gimp)\n")
-    f.write(" -b xfig                    - XFig backend\n")
-    f.write("Algorithm options:\n")
-    f.write(
-        " -z, --turnpolicy <policy>  - how to resolve ambiguities in path decomposition\n"
-    )
-    f.write(
-        " -t, --turdsize <n>         - suppress speckles of up to this size (default 2)\n"
-    )
-    f.write(" -a, --alphamax <n>         - corner threshold parameter (default 1)\n")
-    f.write(" -n, --longcurve            - turn off curve optimization\n")
-    f.write(
-        " -O, --opttolerance <n>     - curve optimization tolerance (default 0.2)\n"
-    )
-    f.write(
-        " -u, --unit <n>             - quantize output to 1/unit pixels (default 10)\n"
-    )
-    f.write(
-        " -d, --debug <n>            - produce debugging output of type n (n=1,2,3)\n"
-    )
-    f.write("Scaling and placement options:\n")
-    f.write(" -P, --pagesize <format>    - page size (default is a4)\n")
-    f.write(" -W, --width <dim>          - width of output image\n")
-    f.write(" -H, --height <dim>         - height of output image\n")
-    f.write(
-        " -r, --resolution <n>[x<n>] - resolution (in dpi) (dimension-based backends)\n"
-    )
-    f.write(" -x, --scale <n>[x<n>]      - scaling factor (pixel-based backends)\n")
-    f.write(" -S, --stretch <n>          - yresolution/xresolution\n")
-    f.write(" -A, --rotate <angle>       - rotate counterclockwise by angle\n")
-    f.write(" -M, --margin <dim>         - margin\n")
-    f.write(" -L, --leftmargin <dim>     - left margin\n")
-    f.write(" -R, --rightmargin <dim>    - right margin\n")
-    f.write(" -T, --topmargin <dim>      - top margin\n")
-    f.write(" -B, --bottommargin <dim>   - bottom margin\n")
-    f.write(" --tight                    - remove whitespace around the input image\n")
-    f.write("Color options, supported by some backends:\n")
-    f.write(" -C, --color #rrggbb        - set foreground color (default black)\n")
-    f.write(" --fillcolor #rrggbb        - set fill color (default transparent)\n")
-    f.write(" --opaque                   - make white shapes opaque\n")
-    f.write("SVG options:\n")
-    f.write(" --group                    - group related paths together\n")
-    f.write(" --flat                     - whole image as a single path\n")
-    f.write("Postscript/EPS/PDF options:\n")
-    f.write(" -c, --cleartext            - do not compress the output\n")
-    f.write(
-        " -2, --level2               - use postscript level 2 compression (default)\n"
-    )
-    if HAVE_ZLIB:
-        f.write(" -3, --level3               - use postscript level 3 compression\n")
-    f.write(" -q, --longcoding           - do not optimize for file size\n")
-    f.write("PGM options:\n")
-    f.write(
-        " -G, --gamma <n>            - gamma value for anti-aliasing (default 2.2)\n"
-    )
-    f.write("Frontend options:\n")
-    f.write(
-        " -k, --blacklevel <n>       - black/white cutoff in input file (default 0.5)\n"
-    )
-    f.write(" -i, --invert               - invert bitmap\n")
-    f.write("Progress bar options:\n")
-    f.write(" --progress                 - show progress bar\n")
-    f.write(" --tty <mode>               - progress bar rendering: vt100 or dumb\n")
-    f.write("\n")
-    f.write("Dimensions can have optional units, e.g. 6.5in, 15cm, 100pt.\n")
-    f.write(
-        f"Default is {DEFAULT_DIM_NAME} (or pixels for pgm, dxf, and gimppath backends).\n"
-    )
-    f.write("Possible input file formats are: pnm (pbm, pgm, ppm), bmp.\n")
-    j = f.write("Backends are: ")
-    BackendList(f, j, 78)
+    f.write(_USAGE_TEXT)
+    BackendList(f, len(_USAGE_BACKENDS_LABEL), 78)
     f.write(".\n")
 
 
 def ParseDimension(s: str) -> Dim:
     s = s.strip()
     res = Dim()
-    try:
+    unit = _UNIT_TABLE.get(s[-2:].lower())
+    if unit is not None and _NUMBER_RE.fullmatch(s, 0, len(s) - 2):
         res.x = float(s[:-2])
-        unit = s[-2:].lower()
-        if unit == "in":
-            res.d = DIM_IN
-        elif unit == "cm":
-            res.d = DIM_CM
-        elif unit == "mm":
-            res.d = DIM_MM
-        elif unit == "pt":
-            res.d = DIM_PT
-        else:
-            res.x = float(s)  # No unit
-    except (ValueError, IndexError):
-        try:
-            res.x = float(s)
-        except ValueError:
-            pass  # Keep default 0.0
-
-    return res
+        res.d = unit
+    elif _NUMBER_RE.fullmatch(s):
+        res.x = float(s)  # No unit
+    return res  # Anything else keeps the default 0.0
 
 
 def ParseDimensions(s: str) -> tuple[Dim, Dim]:
@@ -431,16 +489,16 @@ def DoubleOfDim(d: Dim, default: float) -> float:
 
 
 def ParseColor(s: str) -> int:
-    if s.startswith("#") and len(s) == 7:
-        try:
-            return int(s[1:], 16)
-        except ValueError:
-            return -1
-    return -1
+    if not _COLOR_RE.match(s):
+        return -1
+    return int(s[1:], 16)
 
 
-def DoOptions() -> None:
-    global info
+@functools.lru_cache(maxsize=None)
+def BuildParser() -> "argparse.ArgumentParser":
+    # Imported here so library users who never parse options skip argparse
+    import argparse
+
     parser = argparse.ArgumentParser(add_help=False)
 
     # General options
@@ -458,8 +516,11 @@ def DoOptions() -> None:
     parser.add_argument("filenames", nargs="*", help="input filenames")
     parser.add_argument("-o", "--output", help="write all output to this file")
     parser.add_argument(
-        "--", dest="end_of_options", action="store_true", help=argparse.SUPPRESS
-    )  # Placeholder
+        "-j",
+        "--jobs",
+        type=int,
+        help="process up to n input files in parallel (default 1)",
+    )
 
     # Backend selection
     group_backend = parser.add_mutually_exclusive_group()
@@ -580,12 +641,25 @@ def DoOptions() -> None:
     parser.add_argument("--progress", action="store_true", help="show progress bar")
     parser.add_argument("--tty", help="progress bar rendering: vt100 or dumb")
 
-    args = parser.parse_args()
+    return parser
+
+
+_optionsParsed = False
+
+
+def DoOptions() -> None:
+    import math
+
+    global info, _optionsParsed
+    if _optionsParsed:
+        return  # info already holds this run's options
+
+    args = BuildParser().parse_args()
 
     # Set defaults
-    BackendLookup("eps", [info.backend])
-    info.param = None  # Assuming potrace_param_default() is called later if needed
-    info.progressBar = None  # Assuming DEFAULT_PROGRESS_BAR is used later if needed
+    info.backend = _BACKEND_EPS
+    info.param = _DEFAULT_PARAM
+    info.progressBar = _DEFAULT_PROGRESS_BAR
 
     if args.help:
         UsageInfo(sys.stdout)
@@ -603,36 +677,38 @@ def DoOptions() -> None:
         sys.exit(0)
 
     if args.backend:
-        r = BackendLookup(args.backend, [info.backend])
-        if r == 1:
-            sys.stderr.write(f"{POTRACE}: unrecognized backend -- {args.backend}\n")
-            sys.stderr.write("Use one of: ")
-            BackendList(sys.stderr, 0, 70)
-            sys.stderr.write(".\n")
-            sys.exit(1)
-        elif r == 2:
-            sys.stderr.write(f"{POTRACE}: ambiguous backend -- {args.backend}\n")
-            sys.stderr.write("Use one of: ")
+        r, b = BackendLookup(args.backend)
+        if r == 0:
+            info.backend = b
+        else:
+            problem = "unrecognized" if r == 1 else "ambiguous"
+            sys.stderr.writelines(
+                (f"{POTRACE}: {problem} backend -- {args.backend}\n", "Use one of: ")
+            )
             BackendList(sys.stderr, 0, 70)
             sys.stderr.write(".\n")
             sys.exit(1)
     elif args.svg:
-        BackendLookup("svg", [info.backend])
+        info.backend = _BACKEND_SVG
     elif args.eps:
-        BackendLookup("eps", [info.backend])
+        info.backend = _BACKEND_EPS
     elif args.postscript:
-        BackendLookup("postscript", [info.backend])
+        info.backend = _BACKEND_POSTSCRIPT
     elif args.pgm:
-        BackendLookup("pgm", [info.backend])
+        info.backend = _BACKEND_PGM
 
     if args.output:
         info.outFile = args.output
+    if args.jobs is not None:
+        if args.jobs < 1:
+            sys.stderr.write(f"{POTRACE}: invalid number of jobs -- {args.jobs}\n")
+            sys.exit(1)
+        info.jobs = args.jobs
 
-    info.infiles = [f for f in args.filenames if f != "--"]
-    info.infileCount = len(info.infiles)
+    # argparse already consumes the "--" end-of-options marker
+    info.infiles = args.filenames
+    info.infileCount = len(args.filenames)
     info.someInfiles = bool(info.infileCount)
-    if args.end_of_options:
-        info.someInfiles = True
 
     if args.width:
         info.widthD = ParseDimension(args.width)
@@ -677,67 +753,63 @@ def DoOptions() -> None:
     if args.tight:
         info.tight = True
     if args.rotate is not None:
-        info.angle = args.rotate
-        if info.angle <= -180 or info.angle > 180:
-            info.angle -= 360 * math.ceil(info.angle / 360 - 0.5)
+        if not math.isfinite(args.rotate):
+            sys.stderr.write(f"{POTRACE}: invalid angle -- {args.rotate}\n")
+            sys.exit(1)
+        # Reduce into (-180, 180]; remainder() rounds ties to even, so an
+        # odd multiple of 180 can come back as -180
+        info.angle = math.remainder(args.rotate, 360.0)
+        if info.angle == -180.0:
+            info.angle = 180.0
 
     if args.pagesize:
-        found = False
-        for pf in pageFormats:
-            if pf.name.lower() == args.pagesize.lower():
-                info.paperWidth = pf.w
-                info.paperHeight = pf.h
-                found = True
-                break
-        if not found:
+        pf = _PAGEFORMAT_BY_NAME.get(args.pagesize.lower())
+        if pf is not None:
+            info.paperWidth = pf.w
+            info.paperHeight = pf.h
+        else:
             dimx, dimy = ParseDimensions(args.pagesize)
             if dimx.x != 0 and dimy.x != 0:
                 info.paperWidth = int(round(DoubleOfDim(dimx, DEFAULT_DIM)))
                 info.paperHeight = int(round(DoubleOfDim(dimy, DEFAULT_DIM)))
             else:
-                sys.stderr.write(
-                    f"{POTRACE}: unrecognized page format -- {args.pagesize}\n"
-                )
-                sys.stderr.write("Use one of: ")
                 page_names = [pf.name for pf in pageFormats]
-                sys.stderr.write(", ".join(page_names))
-                sys.stderr.write(", or specify <dim>x<dim>.\n")
+                sys.stderr.writelines(
+                    (
+                        f"{POTRACE}: unrecognized page format -- {args.pagesize}\n",
+                        "Use one of: ",
+                        ", ".join(page_names),
+                        ", or specify <dim>x<dim>.\n",
+                    )
+                )
                 sys.exit(1)
 
     if args.turnpolicy:
-        found = False
-        for tp in turnPolicies:
-            if tp.name.lower() == args.turnpolicy.lower():
-                # info.param.turnpolicy = tp.n  # Assuming param is initialized later
-                found = True
-                break
-        if not found:
-            sys.stderr.write(
-                f"{POTRACE}: unrecognized turnpolicy -- {args.turnpolicy}\n"
-            )
-            sys.stderr.write("Use one of: ")
+        tp = _TURNPOLICY_BY_NAME.get(args.turnpolicy.lower())
+        if tp is None:
             turn_names = [tp.name for tp in turnPolicies]
-            sys.stderr.write(", ".join(turn_names))
-            sys.stderr.write(".\n")
+            sys.stderr.writelines(
+                (
+                    f"{POTRACE}: unrecognized turnpolicy -- {args.turnpolicy}\n",
+                    "Use one of: ",
+                    ", ".join(turn_names),
+                    ".\n",
+                )
+            )
             sys.exit(1)
+        # info.param.turnpolicy = tp.n  # Assuming param is initialized later
 
     if args.turdsize is not None:
         pass  # info.param.turdsize = args.turdsize
     if args.unit is not None:
         info.unit = args.unit
-    if args.cleartext:
-        info.psLevel = 2
-        info.compress = 0
-    elif args.level2:
-        info.psLevel = 2
-        info.compress = 1
-    elif args.level3 and HAVE_ZLIB:
-        info.psLevel = 3
-        info.compress = 1
-    elif args.level3 and not HAVE_ZLIB:
+    # -c/-2/-3 are mutually exclusive; --level3 only exists with zlib
+    psMode = next((m for m in _PS_MODES if getattr(args, m, False)), None)
+    if psMode == "level3" and not HAVE_ZLIB:
         sys.stderr.write(f"{POTRACE}: option -3 not supported, using -2 instead.\n")
-        info.psLevel = 2
-        info.compress = 1
+        psMode = "level2"
+    if psMode is not None:
+        info.psLevel, info.compress = _PS_MODES[psMode]
     if args.longcoding:
         info.longCoding = True
     if args.alphamax is not None:
@@ -781,3 +853,6 @@ def DoOptions() -> None:
                 f"{POTRACE}: invalid tty mode -- {args.tty}. Try --help for more info\n"
             )
             sys.exit(1)
+
+    # Only a complete parse counts; a failed one can be retried
+    _optionsParsed = True
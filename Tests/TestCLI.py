@@ -0,0 +1,411 @@
+# TestCLI.py
+
+import math
+import os
+import signal
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "PythonPotrace", "Python"
+    ),
+)
+
+import main
+import potraceArgParser
+from potraceArgParser import (
+    DEFAULT_DIM,
+    DIM_CM,
+    DIM_IN,
+    DIM_MM,
+    DIM_PT,
+    Dim,
+    DoubleOfDim,
+    ParseDimension,
+    backendListGlobal,
+    info,
+)
+
+INF = float("inf")
+
+
+# Added timeout decorator
+def timeout(seconds):
+    def decorator(func):
+        def _handle_timeout(signum, frame):
+            raise TimeoutError(
+                f"Test '{func.__name__}' timed out after {seconds} seconds."
+            )
+
+        def wrapper(*args, **kwargs):
+            signal.signal(signal.SIGALRM, _handle_timeout)
+            signal.alarm(seconds)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                signal.alarm(0)
+
+        return wrapper
+
+    return decorator
+
+
+def FloatOrNone(s):
+    try:
+        return float(s)
+    except ValueError:
+        return None
+
+
+def ReferenceParseDimension(s):
+    # The float()-based parser ParseDimension replaced, minus its "10xy" quirk
+    s = s.strip()
+    units = {"in": DIM_IN, "cm": DIM_CM, "mm": DIM_MM, "pt": DIM_PT}
+    unit = units.get(s[-2:].lower())
+    if unit is not None and FloatOrNone(s[:-2]) is not None:
+        return float(s[:-2]), unit
+    if FloatOrNone(s) is not None:
+        return float(s), 0.0
+    return 0.0, 0.0
+
+
+def ReferenceCalcDimensions(imgInfo):
+    # The inf-comparison cascade CalcDimensions replaced, with its mock calls dropped
+    if imgInfo.pixwidth == 0:
+        imgInfo.pixwidth = 1
+    if imgInfo.pixheight == 0:
+        imgInfo.pixheight = 1
+
+    dimDef = 1.0 if info.backend.pixel else DEFAULT_DIM
+    maxwidth, maxheight, sc = INF, INF, 1.0
+    defaultScaling = False
+
+    def Convert(d):
+        return DoubleOfDim(d, dimDef) if d.x != INF else INF
+
+    imgInfo.width = Convert(info.widthD)
+    imgInfo.height = Convert(info.heightD)
+    imgInfo.lmar = Convert(info.lmarD)
+    imgInfo.rmar = Convert(info.rmarD)
+    imgInfo.tmar = Convert(info.tmarD)
+    imgInfo.bmar = Convert(info.bmarD)
+
+    if info.backend.pixel:
+        if imgInfo.width == INF and info.sx != INF:
+            imgInfo.width = 1.0
+        if imgInfo.height == INF and info.sy != INF:
+            imgInfo.height = 1.0
+    else:
+        if imgInfo.width == INF and info.rx != INF:
+            imgInfo.width = 72.0
+        if imgInfo.height == INF and info.ry != INF:
+            imgInfo.height = 72.0
+
+    if imgInfo.width == INF and imgInfo.height != INF:
+        imgInfo.width = 1.0
+    elif imgInfo.width != INF and imgInfo.height == INF:
+        imgInfo.height = 1.0
+
+    if imgInfo.width == INF and imgInfo.height == INF:
+        imgInfo.width = 1.0
+        imgInfo.height = 1.0
+        defaultScaling = True
+
+    if defaultScaling and info.backend.fixed:
+        if imgInfo.lmar != INF and imgInfo.rmar != INF:
+            maxwidth = info.paperWidth - imgInfo.lmar - imgInfo.rmar
+        if imgInfo.bmar != INF and imgInfo.tmar != INF:
+            maxheight = info.paperHeight - imgInfo.bmar - imgInfo.tmar
+
+        if maxwidth == INF and maxheight == INF:
+            maxwidth = max(info.paperWidth - 144, info.paperWidth * 0.75)
+            maxheight = max(info.paperHeight - 144, info.paperHeight * 0.75)
+
+        if maxwidth == INF:
+            sc = maxheight
+        elif maxheight == INF:
+            sc = maxwidth
+        else:
+            sc = min(maxwidth, maxheight)
+
+        imgInfo.width *= sc
+        imgInfo.height *= sc
+
+    if info.backend.fixed:
+        if imgInfo.lmar == INF and imgInfo.rmar == INF:
+            imgInfo.lmar = (info.paperWidth - 100) / 2
+        elif imgInfo.lmar == INF:
+            imgInfo.lmar = info.paperWidth - 100
+        elif imgInfo.lmar != INF and imgInfo.rmar != INF:
+            imgInfo.lmar += 10
+
+        if imgInfo.bmar == INF and imgInfo.tmar == INF:
+            imgInfo.bmar = (info.paperHeight - 100) / 2
+        elif imgInfo.bmar == INF:
+            imgInfo.bmar = info.paperHeight - 100
+        elif imgInfo.bmar != INF and imgInfo.tmar != INF:
+            imgInfo.bmar += 10
+    else:
+        if imgInfo.lmar == INF:
+            imgInfo.lmar = 0
+        if imgInfo.rmar == INF:
+            imgInfo.rmar = 0
+        if imgInfo.tmar == INF:
+            imgInfo.tmar = 0
+        if imgInfo.bmar == INF:
+            imgInfo.bmar = 0
+
+
+class TestParseDimension(unittest.TestCase):
+    """
+    Tests for ParseDimension.
+
+    This test suite checks the regex-based parser against float() and the
+    unit table on plain numbers, units, underscores, inf/nan and garbage.
+    """
+
+    CASES = [
+        "10",
+        " 7 ",
+        "-2.5",
+        ".5",
+        "1.",
+        "1e3",
+        "1E+3",
+        "5e",
+        "1_000",
+        "1_000.5_5",
+        "1__0",
+        "_1",
+        "1_",
+        "inf",
+        "-Infinity",
+        "nan",
+        "+NaN",
+        "infin",
+        "10in",
+        "10 in",
+        "3.5CM",
+        "-2e1mm",
+        ".5pt",
+        "1_0Pt",
+        "infpt",
+        "10xyz",
+        "10inch",
+        "10ptx",
+        "10xy",
+        "in",
+        "",
+        "   ",
+        "x",
+    ]
+
+    @timeout(10)
+    def test_MatchesFloat(self):
+        """
+        Test that _NUMBER_RE accepts exactly the strings float() accepts.
+
+        Raises
+        ------
+        AssertionError
+            If the regex and float() disagree on any case.
+        """
+        print("\nRunning test_MatchesFloat...")
+        for s in self.CASES + [c[:-2] for c in self.CASES]:
+            self.assertEqual(
+                bool(potraceArgParser._NUMBER_RE.fullmatch(s)),
+                FloatOrNone(s) is not None,
+                f"_NUMBER_RE and float() disagree on {s!r}.",
+            )
+        print("test_MatchesFloat passed.")
+
+    @timeout(10)
+    def test_ParseDimension(self):
+        """
+        Test ParseDimension values and units against the float()-based parser.
+
+        Raises
+        ------
+        AssertionError
+            If a parsed value or unit differs from the reference.
+        """
+        print("\nRunning test_ParseDimension...")
+        for s in self.CASES:
+            res = ParseDimension(s)
+            x, d = ReferenceParseDimension(s)
+            if math.isnan(x):
+                self.assertTrue(math.isnan(res.x), f"Value mismatch for {s!r}.")
+            else:
+                self.assertEqual(res.x, x, f"Value mismatch for {s!r}.")
+            self.assertEqual(res.d, d, f"Unit mismatch for {s!r}.")
+
+        self.assertEqual(ParseDimension("1_000").x, 1000.0)
+        self.assertEqual(ParseDimension("10xyz").x, 0.0)
+        self.assertEqual(ParseDimension("10inch").d, 0.0)
+        print("test_ParseDimension passed.")
+
+
+class TestCalcDimensions(unittest.TestCase):
+    """
+    Tests for CalcDimensions.
+
+    This test suite compares the unset-mask implementation with the
+    inf-comparison cascade it replaced, for every set/unset combination of
+    width, height and the four margins.
+    """
+
+    def setUp(self):
+        self.saved = {
+            name: getattr(info, name)
+            for name in (
+                "backend",
+                "widthD",
+                "heightD",
+                "lmarD",
+                "rmarD",
+                "tmarD",
+                "bmarD",
+                "sx",
+                "sy",
+                "rx",
+                "ry",
+                "angle",
+            )
+        }
+
+    def tearDown(self):
+        for name, value in self.saved.items():
+            setattr(info, name, value)
+
+    def CheckBackend(self, name):
+        info.backend = next(b for b in backendListGlobal if b.name == name)
+        for bits in range(64):
+            for scale in ((INF, INF), (2.0, INF), (INF, 3.0), (2.0, 3.0)):
+                for angle in (0.0, 30.0):
+                    dims = [
+                        (
+                            Dim(INF)
+                            if bits >> k & 1
+                            else Dim(3.0 + k, (0.0, DIM_IN)[k % 2])
+                        )
+                        for k in range(6)
+                    ]
+                    (
+                        info.widthD,
+                        info.heightD,
+                        info.lmarD,
+                        info.rmarD,
+                        info.tmarD,
+                        info.bmarD,
+                    ) = dims
+                    info.sx, info.sy = scale
+                    info.rx, info.ry = scale
+                    info.angle = angle
+
+                    expected = main.ImgInfo(0, 5)
+                    ReferenceCalcDimensions(expected)
+                    actual = main.ImgInfo(0, 5)
+                    main.CalcDimensions(actual, None)
+
+                    for field in main.ImgInfo.__slots__[:-1]:
+                        self.assertEqual(
+                            getattr(actual, field),
+                            getattr(expected, field),
+                            f"{name}: {field} mismatch for mask {bits:06b}, "
+                            f"scale {scale}, angle {angle}.",
+                        )
+
+    @timeout(10)
+    def test_FixedBackend(self):
+        """
+        Test CalcDimensions on a fixed-page backend (eps).
+
+        Raises
+        ------
+        AssertionError
+            If any ImgInfo field differs from the reference cascade.
+        """
+        print("\nRunning test_FixedBackend...")
+        self.CheckBackend("eps")
+        print("test_FixedBackend passed.")
+
+    @timeout(10)
+    def test_NonFixedBackend(self):
+        """
+        Test CalcDimensions on non-fixed backends (svg, and pixel-based pgm).
+
+        Raises
+        ------
+        AssertionError
+            If any ImgInfo field differs from the reference cascade.
+        """
+        print("\nRunning test_NonFixedBackend...")
+        self.CheckBackend("svg")
+        self.CheckBackend("pgm")
+        print("test_NonFixedBackend passed.")
+
+
+class TestJobGrouping(unittest.TestCase):
+    """
+    Tests for GroupInfilesByOutput, which splits -j inputs into groups that
+    never write the same output file.
+    """
+
+    @timeout(10)
+    def test_SharedOutputs(self):
+        """
+        Test that inputs sharing an output file land in one ordered group.
+
+        Raises
+        ------
+        AssertionError
+            If colliding inputs are split or group order changes.
+        """
+        print("\nRunning test_SharedOutputs...")
+        groups = main.GroupInfilesByOutput(
+            ["a.pbm", "b.pbm", "./a.pbm", "a.bmp", "sub/../b.pbm", "-", "c.eps", "-"],
+            ".eps",
+        )
+        self.assertEqual(
+            groups,
+            [
+                ["a.pbm", "./a.pbm", "a.bmp"],
+                ["b.pbm", "sub/../b.pbm"],
+                ["-", "-"],
+                ["c.eps"],
+            ],
+            "Inputs grouped incorrectly.",
+        )
+        print("test_SharedOutputs passed.")
+
+    @timeout(10)
+    def test_Symlink(self):
+        """
+        Test that paths through a symlinked directory share a group.
+
+        Raises
+        ------
+        AssertionError
+            If the symlinked path is placed in its own group.
+        """
+        print("\nRunning test_Symlink...")
+        with tempfile.TemporaryDirectory() as tmp:
+            link = os.path.join(tmp, "link")
+            try:
+                os.symlink(tmp, link)
+            except (OSError, NotImplementedError):
+                self.skipTest("symlinks not supported")
+            a = os.path.join(tmp, "a.pbm")
+            b = os.path.join(tmp, "b.pbm")
+            aLinked = os.path.join(link, "a.pbm")
+            groups = main.GroupInfilesByOutput([a, b, aLinked], ".svg")
+            self.assertEqual(groups, [[a, aLinked], [b]], "Symlink not resolved.")
+        print("test_Symlink passed.")
+
+
+if __name__ == "__main__":
+
+    unittest.main(verbosity=2)